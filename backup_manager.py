@@ -7,27 +7,104 @@ and controlling the background backup service.
 
 import sys
 import os
-import datetime
+import atexit
+import contextlib
+import io
+import json
+import re
+import select
+import signal
 import subprocess
-from typing import Union
+import time
+from typing import List, Union
 
 LOG_FILE = "logs/backup_manager.log"
+_LOG_DIR = os.path.dirname(LOG_FILE)
+_TIMESTAMP_FORMAT = "[%d/%m/%Y %H:%M]"
 SCHEDULES_FILE = "backup_schedules.txt"
 BACKUPS_DIR = "backups"
 SERVICE_SCRIPT = "backup_service.py"
+BACKUP_ENGINE = os.environ.get("BACKUP_ENGINE", "tar")
+RESTIC_REPOSITORY = os.path.join(BACKUPS_DIR, "restic-repo")
+LOG_FLUSH_BYTES = 4096  # Buffered log size that triggers a write
+STOP_TIMEOUT = 3.0  # Seconds to wait for the service to exit before SIGKILL
+
+
+_log_buf = io.BytesIO()
+
+# Log file descriptor, kept open across writes, and the cached timestamp text
+_log_state = {"fd": None, "minute": -1, "timestamp": ""}
+
+
+def _log_fd() -> int:
+    """
+    Returns the log file descriptor, opening the log file on first use.
+
+    Returns:
+        int: A file descriptor open for appending to the manager log file.
+    """
+    if _log_state["fd"] is None:
+        os.makedirs(_LOG_DIR, exist_ok=True)
+        _log_state["fd"] = os.open(
+            LOG_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644
+        )
+    return _log_state["fd"]
+
+
+def _flush_log() -> None:
+    """
+    Appends all buffered log lines to the manager log file in one write.
+    """
+    data = _log_buf.getvalue()
+    if not data:
+        return
+    os.write(_log_fd(), data)
+    _log_buf.seek(0)
+    _log_buf.truncate()
+
+
+def _close_log() -> None:
+    """
+    Flushes the remaining log lines and closes the log file.
+    """
+    _flush_log()
+    if _log_state["fd"] is not None:
+        os.close(_log_state["fd"])
+        _log_state["fd"] = None
+
+
+atexit.register(_close_log)
+
+
+def _timestamp() -> str:
+    """
+    Returns the log timestamp for the current time. The text is formatted
+    once per minute and reused for every message logged within that minute.
+
+    Returns:
+        str: The timestamp in the format "[dd/mm/yyyy hh:mm]".
+    """
+    minute = int(time.time()) // 60
+    if minute != _log_state["minute"]:
+        _log_state["timestamp"] = time.strftime(_TIMESTAMP_FORMAT, time.localtime())
+        _log_state["minute"] = minute
+    return _log_state["timestamp"]
 
 
 def log_message(message: str) -> None:
     """
     Logs a message with a timestamp to the manager log file.
 
+    Messages are buffered and written when the buffer fills up or the
+    program exits.
+
     Args:
         message (str): The message to log.
     """
-    os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
-    timestamp = datetime.datetime.now().strftime("[%d/%m/%Y %H:%M]")
-    with open(LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(f"{timestamp} {message}\n")
+    timestamp = _timestamp()
+    _log_buf.write(f"{timestamp} {message}\n".encode("utf-8"))
+    if _log_buf.tell() >= LOG_FLUSH_BYTES:
+        _flush_log()
 
 
 def create_schedule(schedule_str: str) -> None:
@@ -50,13 +127,35 @@ def create_schedule(schedule_str: str) -> None:
         if not (0 <= hour <= 23 and 0 <= minute <= 59):
             raise ValueError(f"malformed schedule: {schedule_str}")
 
-        with open(SCHEDULES_FILE, "a", encoding="utf-8") as f:
-            f.write(f"{schedule_str}\n")
+        with open(SCHEDULES_FILE, "ab", buffering=0) as f:
+            f.write(f"{schedule_str}\n".encode("utf-8"))
         log_message(f"New schedule added: {schedule_str}")
+        _notify_service()
     except (ValueError, OSError) as e:
         log_message(f"Error: {str(e)}")
 
 
+def _write_schedules(lines: List[str]) -> None:
+    """
+    Atomically replaces the schedules file with the given lines.
+
+    The lines are written to a temporary file that is then renamed over the
+    schedules file, so a crash never leaves a truncated file behind.
+
+    Args:
+        lines (list): The schedule lines to write, including line endings.
+    """
+    tmp_path = f"{SCHEDULES_FILE}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8", buffering=1 << 16) as f:
+            f.writelines(lines)
+        os.replace(tmp_path, SCHEDULES_FILE)
+    except OSError:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+
+
 def list_schedules() -> None:
     """
     Lists all scheduled backups from the schedules file.
@@ -92,32 +191,133 @@ def delete_schedule(index: Union[int, str]) -> None:
         idx = int(index)
         if 0 <= idx < len(schedules):
             removed = schedules.pop(idx)
-            with open(SCHEDULES_FILE, "w", encoding="utf-8") as f:
-                f.writelines(schedules)
+            _write_schedules(schedules)
             log_message(f"Schedule at index {idx} deleted: {removed.strip()}")
+            _notify_service()
         else:
             raise IndexError(f"can't find schedule at index {idx}")
     except (ValueError, IndexError, FileNotFoundError, OSError) as e:
         log_message(f"Error: {str(e)}")
 
 
+def _pgrep_service_pids() -> List[int]:
+    """
+    Finds the PIDs of running backup service processes with pgrep, for
+    systems without a /proc filesystem.
+
+    Returns:
+        List[int]: The PIDs of Python processes running the service script.
+    """
+    result = subprocess.run(
+        ["pgrep", "-f", f"python.*{re.escape(SERVICE_SCRIPT)}"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    own_pid = os.getpid()
+    return [int(pid) for pid in result.stdout.split() if int(pid) != own_pid]
+
+
+def _find_service_pids() -> List[int]:
+    """
+    Finds the PIDs of running backup service processes by scanning /proc,
+    falling back to pgrep where /proc is not available.
+
+    Returns:
+        List[int]: The PIDs of Python processes running the service script.
+    """
+    if not os.path.isdir("/proc"):
+        return _pgrep_service_pids()
+
+    own_pid = os.getpid()
+    script = SERVICE_SCRIPT.encode()
+    pids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit() or int(entry) == own_pid:
+            continue
+        try:
+            with open(f"/proc/{entry}/cmdline", "rb") as f:
+                argv = f.read().split(b"\x00")
+        except OSError:
+            # Process exited during the scan or is not readable
+            continue
+        # Only match Python interpreters running the script, not e.g. an editor
+        if os.path.basename(argv[0]).startswith(b"python") and any(
+            os.path.basename(arg) == script for arg in argv[1:]
+        ):
+            pids.append(int(entry))
+    return pids
+
+
+def _wait_for_exit(pid: int, timeout: float) -> bool:
+    """
+    Waits for a process to exit, for at most the given number of seconds.
+
+    Uses a pidfd where the kernel supports it, so the wait ends as soon as
+    the process dies; otherwise falls back to polling /proc/<pid>.
+
+    Args:
+        pid (int): The process to wait for.
+        timeout (float): The maximum time to wait, in seconds.
+
+    Returns:
+        bool: True if the process has exited, False on timeout.
+    """
+    if hasattr(os, "pidfd_open"):
+        try:
+            fd = os.pidfd_open(pid)
+        except ProcessLookupError:
+            return True
+        except OSError:
+            # pidfd_open is not supported by the running kernel
+            fd = None
+        if fd is not None:
+            try:
+                poller = select.poll()
+                poller.register(fd, select.POLLIN)
+                return bool(poller.poll(int(timeout * 1000)))
+            finally:
+                os.close(fd)
+
+    deadline = time.monotonic() + timeout
+    while os.path.exists(f"/proc/{pid}"):
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+def _notify_service() -> None:
+    """
+    Sends SIGHUP to a running backup service so it re-reads the schedules.
+    """
+    for pid in _find_service_pids():
+        try:
+            os.kill(pid, signal.SIGHUP)
+        except OSError:
+            # The service exited in the meantime; nothing to notify
+            pass
+
+
 def start_service() -> None:
     """
     Starts the backup service as a background process.
     """
     try:
         # Verify if the service is already running to avoid duplicate instances
-        check_cmd = f"ps -A -f | grep {SERVICE_SCRIPT} | grep -v grep"
-        result = subprocess.run(
-            check_cmd, shell=True, capture_output=True, text=True, check=False
-        )
-        if result.stdout.strip():
+        if _find_service_pids():
             log_message("Error: backup_service already running")
             return
 
-        # No 'with' statement used because the service must continue running as a daemon
-        # pylint: disable=consider-using-with
-        subprocess.Popen([sys.executable, SERVICE_SCRIPT], start_new_session=True)
+        # No 'with' statement used because the service must continue running as a daemon.
+        # The service inherits SIGHUP ignored (this survives exec) so a create or
+        # delete signalling it before it installs its handler cannot kill it.
+        previous = signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        try:
+            # pylint: disable=consider-using-with
+            subprocess.Popen([sys.executable, SERVICE_SCRIPT], start_new_session=True)
+        finally:
+            signal.signal(signal.SIGHUP, previous)
         log_message("backup_service started")
     except (OSError, subprocess.SubprocessError) as e:
         log_message(f"Error: backup_service failed to start: {str(e)}")
@@ -125,47 +325,91 @@ def start_service() -> None:
 
 def stop_service() -> None:
     """
-    Stops the background backup service by terminating its process.
+    Stops the background backup service by terminating its process and
+    waiting for it to exit, escalating to SIGKILL if it does not.
     """
     try:
-        # Find PID
-        check_cmd = f"ps -A -f | grep {SERVICE_SCRIPT} | grep -v grep"
-        result = subprocess.run(
-            check_cmd, shell=True, capture_output=True, text=True, check=False
-        )
-        if not result.stdout.strip():
+        pids = _find_service_pids()
+        if not pids:
             raise RuntimeError("can't stop backup_service")
 
-        # Extract PID from the process list output (typically the second column)
-        for line in result.stdout.strip().split("\n"):
-            parts = line.split()
-            if len(parts) > 1:
-                pid = int(parts[1])
-                os.kill(pid, 15)  # SIGTERM
+        for pid in pids:
+            os.kill(pid, signal.SIGTERM)
+
+        # Wait until the service has really exited so a following start does not race it
+        for pid in pids:
+            if not _wait_for_exit(pid, STOP_TIMEOUT):
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    continue
+                if not _wait_for_exit(pid, STOP_TIMEOUT):
+                    raise RuntimeError("can't stop backup_service")
 
         log_message("backup_service stopped")
-    except (OSError, ValueError, RuntimeError) as e:
+    except (OSError, RuntimeError) as e:
         log_message(f"Error: {str(e)}")
 
 
+def _list_restic_snapshots() -> List[str]:
+    """
+    Lists the snapshots in the restic repository without locking it.
+
+    Returns:
+        List[str]: One line per snapshot: its backup name, ID and time.
+
+    Raises:
+        subprocess.SubprocessError: If restic fails, with its error output.
+    """
+    result = subprocess.run(
+        ["restic", "-r", RESTIC_REPOSITORY, "--no-lock", "snapshots", "--json"],
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise subprocess.SubprocessError(result.stderr.strip())
+    return [
+        f"{','.join(snap.get('tags', []))} ({snap['short_id']}, {snap['time'][:16]})"
+        for snap in json.loads(result.stdout)
+    ]
+
+
 def list_backups() -> None:
     """
-    Lists all created backup files in the backups directory.
+    Lists all created backup files in the backups directory, followed by
+    the restic snapshots when BACKUP_ENGINE is "restic".
     """
     try:
         if not os.path.exists(BACKUPS_DIR):
             os.makedirs(BACKUPS_DIR, exist_ok=True)
 
-        files = [
-            f
-            for f in os.listdir(BACKUPS_DIR)
-            if os.path.isfile(os.path.join(BACKUPS_DIR, f))
-        ]
-        for f in files:
-            print(f)
-        log_message("Show backups list")
+        # DirEntry.is_file uses the file type from the directory listing itself.
+        # Manifests of incremental backups are bookkeeping, not backups.
+        with os.scandir(BACKUPS_DIR) as it:
+            files = [
+                e.name
+                for e in it
+                if e.is_file(follow_symlinks=False)
+                and not e.name.endswith((".manifest.json", ".manifest.json.tmp"))
+            ]
     except OSError:
         log_message("Error: can't find backups directory")
+        return
+
+    if files:
+        print("\n".join(files))
+
+    if BACKUP_ENGINE == "restic" and os.path.isdir(RESTIC_REPOSITORY):
+        try:
+            snapshots = _list_restic_snapshots()
+        except (OSError, subprocess.SubprocessError, KeyError, ValueError) as e:
+            log_message(f"Error: can't list restic snapshots: {str(e)}")
+            return
+        if snapshots:
+            print("\n".join(snapshots))
+    log_message("Show backups list")
 
 
 def main() -> None:
@@ -5,32 +5,583 @@ This script runs as a background process, monitoring backup schedules
 and performing file compression (tar) at the scheduled times.
 """
 
-import time
+import sys
+import atexit
+import bisect
+import concurrent.futures
+import contextlib
+import ctypes
+import ctypes.util
 import datetime
+import functools
+import hashlib
+import io
+import json
 import os
+import select
+import shutil
+import signal
+import subprocess
 import tarfile
+import threading
+import time
+from types import FrameType
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
 
 LOG_FILE = "logs/backup_service.log"
+_LOG_DIR = os.path.dirname(LOG_FILE)
+_TIMESTAMP_FORMAT = "[%d/%m/%Y %H:%M]"
 SCHEDULES_FILE = "backup_schedules.txt"
 BACKUPS_DIR = "backups"
+LOG_FLUSH_BYTES = 4096  # Buffered log size that triggers a write
+
+# External compressors the tar stream can be piped through: command and archive suffix
+COMPRESSORS = {
+    "pigz": (["pigz", "--rsyncable", "-1", "-c"], ".gz"),
+    "zstd": (["zstd", "-q", "-T0", "--long", "--rsyncable", "-c"], ".zst"),
+}
+BACKUP_COMPRESSOR = os.environ.get("BACKUP_COMPRESSOR", "pigz")
+
+# "tar" writes one archive per backup, "restic" stores deduplicated snapshots
+BACKUP_ENGINE = os.environ.get("BACKUP_ENGINE", "tar")
+RESTIC_REPOSITORY = os.path.join(BACKUPS_DIR, "restic-repo")
+# With BACKUP_INCREMENTAL=1, repeated backups only archive files that changed
+BACKUP_INCREMENTAL = os.environ.get("BACKUP_INCREMENTAL") == "1"
+MANIFEST_HASH = "sha256"  # Content hash recorded in backup manifests
+DEFAULT_TAR_BUFSIZE = 2 * 1024 * 1024  # Archive I/O size unless TAR_BUFSIZE is set
+BACKUP_WORKERS = min(4, os.cpu_count() or 1)  # Backups run concurrently per minute
+MAX_SLEEP = 3600  # Upper bound on one sleep, in seconds, in case the clock changes
+RETRY_SLEEP = 45  # Upper bound on the sleep after an error in the service loop
+
+# inotify(7) events that signal a new version of a file in the watched directory
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+
+# Archive name -> [size, mtime_ns, content digest] of each archived file
+Manifest = Dict[str, list]
+
+# (path, minutes since midnight, "HH:MM", name, position in file)
+Schedule = Tuple[str, int, str, str, int]
+
+# Parsed schedules sorted by time, their minutes, whether blank or malformed lines
+# were skipped, and the (st_mtime_ns, st_size) of the file they were read from
+_cache = {"key": None, "parsed": [], "minutes": [], "skipped": False}
+
+
+_log_buf = io.BytesIO()
+_log_lock = threading.Lock()
+
+# Log file descriptor, kept open across writes until a SIGHUP requests a
+# reopen (e.g. after logrotate), and the cached timestamp text
+_log_state = {"fd": None, "reopen": False, "minute": -1, "timestamp": ""}
+
+_pool = concurrent.futures.ThreadPoolExecutor(max_workers=BACKUP_WORKERS)
+
+# One lock per backup name, so backups writing the same archive never overlap
+_archive_locks = {}
+_archive_locks_guard = threading.Lock()
+
+# Guards restic repository initialisation, separate from the per-name locks
+_restic_init_lock = threading.Lock()
+
+
+def _log_fd() -> int:
+    """
+    Returns the log file descriptor, opening the log file on first use and
+    again after a reopen was requested.
+
+    Returns:
+        int: A file descriptor open for appending to the service log file.
+    """
+    if _log_state["reopen"] and _log_state["fd"] is not None:
+        os.close(_log_state["fd"])
+        _log_state["fd"] = None
+    _log_state["reopen"] = False
+    if _log_state["fd"] is None:
+        os.makedirs(_LOG_DIR, exist_ok=True)
+        _log_state["fd"] = os.open(
+            LOG_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644
+        )
+    return _log_state["fd"]
+
+
+def _flush_log() -> None:
+    """
+    Appends all buffered log lines to the service log file in one write.
+    """
+    with _log_lock:
+        data = _log_buf.getvalue()
+        if not data:
+            return
+        os.write(_log_fd(), data)
+        _log_buf.seek(0)
+        _log_buf.truncate()
+
+
+def _close_log() -> None:
+    """
+    Flushes the remaining log lines and closes the log file.
+    """
+    _flush_log()
+    if _log_state["fd"] is not None:
+        os.close(_log_state["fd"])
+        _log_state["fd"] = None
+
+
+atexit.register(_close_log)
+
+
+def _timestamp() -> str:
+    """
+    Returns the log timestamp for the current time. The text is formatted
+    once per minute and reused for every message logged within that minute.
+
+    Returns:
+        str: The timestamp in the format "[dd/mm/yyyy hh:mm]".
+    """
+    minute = int(time.time()) // 60
+    if minute != _log_state["minute"]:
+        _log_state["timestamp"] = time.strftime(_TIMESTAMP_FORMAT, time.localtime())
+        _log_state["minute"] = minute
+    return _log_state["timestamp"]
 
 
 def log_message(message: str) -> None:
     """
     Logs a message with a timestamp to the service log file.
 
+    Messages are buffered and written at the end of each service loop
+    iteration, when the buffer fills up, or when the service exits.
+
     Args:
         message (str): The message to log.
     """
-    os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
-    timestamp = datetime.datetime.now().strftime("[%d/%m/%Y %H:%M]")
-    with open(LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(f"{timestamp} {message}\n")
+    timestamp = _timestamp()
+    with _log_lock:
+        _log_buf.write(f"{timestamp} {message}\n".encode("utf-8"))
+        full = _log_buf.tell() >= LOG_FLUSH_BYTES
+    if full:
+        _flush_log()
+
+
+def _read_tar_bufsize() -> int:
+    """
+    Reads the archive I/O size from the TAR_BUFSIZE environment variable.
+
+    Returns:
+        int: The configured size in bytes, or DEFAULT_TAR_BUFSIZE if the
+        variable is unset or not a positive integer (which is logged).
+    """
+    value = os.environ.get("TAR_BUFSIZE")
+    if value is None:
+        return DEFAULT_TAR_BUFSIZE
+    try:
+        size = int(value)
+    except ValueError:
+        size = 0
+    if size <= 0:
+        log_message(
+            f"Error: invalid TAR_BUFSIZE {value!r}, using {DEFAULT_TAR_BUFSIZE}"
+        )
+        return DEFAULT_TAR_BUFSIZE
+    return size
+
+
+TAR_BUFSIZE = _read_tar_bufsize()
+
+
+# Archive names of backup sources; the same few paths are backed up repeatedly
+_basename = functools.lru_cache(maxsize=256)(os.path.basename)
+
+
+def _compressor() -> Tuple[Optional[List[str]], str]:
+    """
+    Selects the compressor configured with BACKUP_COMPRESSOR.
+
+    Returns:
+        tuple: The compressor command and the suffix it adds to ".tar", or
+        (None, "") for an uncompressed archive when no known compressor is
+        configured or installed.
+    """
+    command, suffix = COMPRESSORS.get(BACKUP_COMPRESSOR, (None, ""))
+    if command is None or shutil.which(command[0]) is None:
+        return None, ""
+    return command, suffix
+
+
+def _archive_lock(name: str) -> threading.Lock:
+    """
+    Returns the lock that guards the archive of the given backup name.
+
+    Args:
+        name (str): The backup name.
+
+    Returns:
+        threading.Lock: The lock for that name, created on first use.
+    """
+    with _archive_locks_guard:
+        return _archive_locks.setdefault(name, threading.Lock())
+
+
+def _open_tar_stream(fileobj: BinaryIO) -> tarfile.TarFile:
+    """
+    Opens a streaming tar writer that reads source files and writes the
+    archive in TAR_BUFSIZE chunks instead of tarfile's small defaults.
+
+    Args:
+        fileobj (BinaryIO): The file or pipe the archive is written to.
+
+    Returns:
+        tarfile.TarFile: The open archive.
+    """
+    return tarfile.open(
+        fileobj=fileobj, mode="w|", bufsize=TAR_BUFSIZE, copybufsize=TAR_BUFSIZE
+    )
+
+
+def _fadvise(fd: int, advice_name: str) -> None:
+    """
+    Gives the kernel a hint about how a file will be accessed, where supported.
+    The hint is only advisory, so failures (e.g. on a pipe) are ignored.
+
+    Args:
+        fd (int): The open file descriptor.
+        advice_name (str): The name of an os.POSIX_FADV_* constant.
+    """
+    if hasattr(os, "posix_fadvise"):
+        with contextlib.suppress(OSError):
+            os.posix_fadvise(fd, 0, 0, getattr(os, advice_name))
+
+
+class _HashingReader:
+    """
+    Read-only file wrapper that feeds everything read through it into a hash.
+    """
+
+    def __init__(self, f: BinaryIO, digest: Any) -> None:
+        self._f = f
+        self._digest = digest
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Reads from the wrapped file and updates the hash with the data.
+
+        Args:
+            size (int): The maximum number of bytes to read.
+
+        Returns:
+            bytes: The data read.
+        """
+        data = self._f.read(size)
+        self._digest.update(data)
+        return data
+
+
+def _new_hash() -> Any:
+    """
+    Creates a MANIFEST_HASH hash object. Digests only detect changed files,
+    so OpenSSL may use its fastest implementation (e.g. SHA extensions).
+
+    Returns:
+        hashlib hash object: An empty hash.
+    """
+    return hashlib.new(MANIFEST_HASH, usedforsecurity=False)
+
+
+def _file_digest(path: str) -> str:
+    """
+    Hashes a file's content with MANIFEST_HASH.
+
+    Args:
+        path (str): The file to hash.
+
+    Returns:
+        str: The hex digest.
+    """
+    with open(path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, _new_hash).hexdigest()
+
+        # Python < 3.11: read into one reused buffer instead of new bytes objects
+        digest = _new_hash()
+        buf = bytearray(TAR_BUFSIZE)
+        view = memoryview(buf)
+        while size := f.readinto(buf):
+            digest.update(view[:size])
+        return digest.hexdigest()
+
+
+def _unchanged(path: str, st: os.stat_result, entry: list) -> bool:
+    """
+    Checks whether a file still matches its entry in the previous manifest.
+
+    Size and modification time decide on their own; the content is only
+    hashed when the size matches but the modification time does not.
+
+    Args:
+        path (str): The file to check.
+        st (os.stat_result): The file's current status.
+        entry (list): The [size, mtime_ns, digest] recorded last time.
+
+    Returns:
+        bool: True if the file does not need to be archived again.
+    """
+    size, mtime_ns, digest = entry
+    if st.st_size != size:
+        return False
+    if st.st_mtime_ns == mtime_ns:
+        return True
+    return digest is not None and _file_digest(path) == digest
+
+
+def _add_tree(
+    tar: tarfile.TarFile,
+    path: str,
+    arcname: str,
+    exclude: str,
+    previous: Optional[Manifest] = None,
+    manifest: Optional[Manifest] = None,
+) -> None:
+    """
+    Adds a file or directory tree to an archive, like TarFile.add. As with
+    TarFile.add, the archive being written is skipped if it is in the tree.
+
+    Regular files are read with sequential readahead and dropped from the
+    page cache afterwards, so large backups do not evict other cached data.
+    When a manifest is given, every regular file and hard link is recorded in
+    it, and files unchanged since the previous manifest are left out of the
+    archive.
+
+    Args:
+        tar (tarfile.TarFile): The archive being written.
+        path (str): The file or directory to add.
+        arcname (str): The name of the path inside the archive.
+        exclude (str): The absolute path of the archive being written.
+        previous (dict): The manifest of the previous backup, if any.
+        manifest (dict): The manifest to record archived files in, if any.
+    """
+    if os.path.abspath(path) == exclude:
+        return
+
+    tarinfo = tar.gettarinfo(path, arcname)
+    if tarinfo is None:
+        # Sockets and other types tar cannot store
+        return
+
+    if tarinfo.isreg():
+        if manifest is not None:
+            st = os.stat(path, follow_symlinks=False)
+            entry = previous.get(arcname) if previous else None
+            if entry is not None and _unchanged(path, st, entry):
+                manifest[arcname] = [st.st_size, st.st_mtime_ns, entry[2]]
+                # gettarinfo registered the inode; forget it so a later hard
+                # link is archived as a regular file instead of a link to a
+                # member that is not in this archive
+                tar.inodes.pop((st.st_ino, st.st_dev), None)
+                return
+
+        with open(path, "rb") as f:
+            _fadvise(f.fileno(), "POSIX_FADV_SEQUENTIAL")
+            if manifest is None:
+                tar.addfile(tarinfo, f)
+            else:
+                digest = _new_hash()
+                tar.addfile(tarinfo, _HashingReader(f, digest))
+                manifest[arcname] = [st.st_size, st.st_mtime_ns, digest.hexdigest()]
+            _fadvise(f.fileno(), "POSIX_FADV_DONTNEED")
+    elif tarinfo.isdir():
+        tar.addfile(tarinfo)
+        for entry in sorted(os.listdir(path)):
+            _add_tree(
+                tar,
+                os.path.join(path, entry),
+                os.path.join(arcname, entry),
+                exclude,
+                previous,
+                manifest,
+            )
+    else:
+        if tarinfo.islnk() and manifest is not None:
+            # A hard link has the same content as the member it points to
+            manifest[arcname] = list(manifest[tarinfo.linkname])
+        tar.addfile(tarinfo)
+
+
+def _drop_written_pages(f: BinaryIO) -> None:
+    """
+    Writes a finished file out to disk and drops it from the page cache.
+
+    Archives are not read back soon after a backup, so keeping them cached
+    would only evict other processes' data. Dirty pages cannot be dropped,
+    hence the data sync first.
+
+    Args:
+        f (BinaryIO): The open file, written by this process or a child.
+    """
+    f.flush()
+    if hasattr(os, "fdatasync"):
+        os.fdatasync(f.fileno())
+    _fadvise(f.fileno(), "POSIX_FADV_DONTNEED")
+
+
+def _write_archive(
+    path: str,
+    backup_path: str,
+    command: Optional[List[str]],
+    previous: Optional[Manifest] = None,
+) -> Optional[Manifest]:
+    """
+    Writes a tar archive of a directory, optionally piped through a compressor.
+
+    Args:
+        path (str): The source directory path to archive.
+        backup_path (str): The archive file to create.
+        command (list): The compressor command, or None for a plain tar.
+        previous (dict): The manifest of the previous backup; when given,
+            only files that changed since then are archived.
+
+    Returns:
+        dict: The manifest of the source tree when previous was given,
+        otherwise None.
+    """
+    manifest = None if previous is None else {}
+    arcname = _basename(path)
+    exclude = os.path.abspath(backup_path)
+    with open(backup_path, "wb", buffering=TAR_BUFSIZE) as out:
+        if command is None:
+            with _open_tar_stream(out) as tar:
+                _add_tree(tar, path, arcname, exclude, previous, manifest)
+        else:
+            with subprocess.Popen(command, stdin=subprocess.PIPE, stdout=out) as proc:
+                with _open_tar_stream(proc.stdin) as tar:
+                    _add_tree(tar, path, arcname, exclude, previous, manifest)
+            if proc.returncode != 0:
+                raise OSError(f"{command[0]} exited with status {proc.returncode}")
+
+        _drop_written_pages(out)
+    return manifest
+
+
+def _load_manifest(manifest_path: str) -> Optional[Manifest]:
+    """
+    Loads a backup manifest written by _save_manifest.
+
+    Args:
+        manifest_path (str): The manifest file.
+
+    Returns:
+        dict: The recorded files, with digests cleared if they were made with
+        a different hash algorithm, or None if there is no readable manifest.
+    """
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        files = data["files"]
+        if data.get("hash") != MANIFEST_HASH:
+            files = {arcname: [e[0], e[1], None] for arcname, e in files.items()}
+        return files
+    except FileNotFoundError:
+        return None
+    except (ValueError, KeyError, TypeError, IndexError):
+        # A corrupt manifest just means the next backup is a full one
+        return None
+
+
+def _save_manifest(manifest_path: str, files: Manifest) -> None:
+    """
+    Atomically writes a backup manifest.
+
+    Args:
+        manifest_path (str): The manifest file.
+        files (dict): Archive name -> [size, mtime_ns, digest] of every file.
+    """
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8", buffering=1 << 16) as f:
+        json.dump({"hash": MANIFEST_HASH, "files": files}, f)
+    os.replace(tmp_path, manifest_path)
+
+
+def _incremental_backup(
+    path: str, name: str, command: Optional[List[str]], suffix: str
+) -> str:
+    """
+    Backs up a directory against its manifest. The first backup is a full
+    archive; later ones only contain the files that changed since the
+    previous backup and are timestamped.
+
+    Args:
+        path (str): The source directory path to back up.
+        name (str): The backup name.
+        command (list): The compressor command, or None for a plain tar.
+        suffix (str): The compressor's archive suffix.
+
+    Returns:
+        str: The archive that was written.
+    """
+    backup_path = os.path.join(BACKUPS_DIR, f"{name}.tar{suffix}")
+    manifest_path = os.path.join(BACKUPS_DIR, f"{name}.manifest.json")
+
+    previous = None
+    if os.path.exists(backup_path):
+        previous = _load_manifest(manifest_path)
+    if previous is not None:
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        backup_path = os.path.join(BACKUPS_DIR, f"{name}.{stamp}.tar{suffix}")
+
+    manifest = _write_archive(path, backup_path, command, previous or {})
+    _save_manifest(manifest_path, manifest)
+    return backup_path
+
+
+def _run_restic(args: List[str]) -> None:
+    """
+    Runs a restic command against the repository.
+
+    Args:
+        args (list): The restic subcommand and its arguments.
+
+    Raises:
+        subprocess.SubprocessError: If restic fails; the message carries
+        restic's own error output.
+    """
+    result = subprocess.run(
+        ["restic", "-r", RESTIC_REPOSITORY, *args],
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise subprocess.SubprocessError(
+            f"restic {args[0]} failed: {result.stderr.strip()}"
+        )
+
+
+def _restic_backup(path: str, name: str) -> None:
+    """
+    Stores a snapshot of a directory in the restic repository, tagged with
+    the backup name. The repository is initialised on first use; restic
+    takes its password from RESTIC_PASSWORD or RESTIC_PASSWORD_FILE.
+
+    Args:
+        path (str): The source directory path to back up.
+        name (str): The backup name used as the snapshot tag.
+    """
+    with _restic_init_lock:
+        if not os.path.exists(os.path.join(RESTIC_REPOSITORY, "config")):
+            _run_restic(["init"])
+    _run_restic(["backup", "--tag", name, path])
 
 
 def perform_backup(path: str, name: str) -> None:
     """
-    Creates a compressed tar archive of the specified directory.
+    Creates a compressed tar archive of the specified directory, or a restic
+    snapshot when BACKUP_ENGINE is "restic".
+
+    The tar stream is piped through the configured compressor, which runs
+    as a separate process so archiving and compression proceed in parallel.
+    Safe to call from several threads at once.
 
     Args:
         path (str): The source directory path to back up.
@@ -38,63 +589,251 @@ def perform_backup(path: str, name: str) -> None:
     """
     try:
         os.makedirs(BACKUPS_DIR, exist_ok=True)
-        backup_path = os.path.join(BACKUPS_DIR, f"{name}.tar")
+        if BACKUP_ENGINE == "restic":
+            with _archive_lock(name):
+                _restic_backup(path, name)
+            log_message(f"Backup done for {path} in {RESTIC_REPOSITORY} ({name})")
+            return
 
-        with tarfile.open(backup_path, "w") as tar:
-            tar.add(path, arcname=os.path.basename(path))
+        command, suffix = _compressor()
+        with _archive_lock(name):
+            if BACKUP_INCREMENTAL:
+                backup_path = _incremental_backup(path, name, command, suffix)
+            else:
+                backup_path = os.path.join(BACKUPS_DIR, f"{name}.tar{suffix}")
+                _write_archive(path, backup_path, command)
 
         log_message(f"Backup done for {path} in {backup_path}")
-    except (OSError, tarfile.TarError) as e:
+    except (OSError, tarfile.TarError, subprocess.SubprocessError) as e:
         log_message(f"Error performing backup for {path}: {str(e)}")
 
 
+def _read_schedules() -> Tuple[List[Schedule], List[int], bool]:
+    """
+    Reads and parses the schedules file. The parsed list is cached and
+    reused for as long as the file's modification time and size are unchanged.
+
+    Returns:
+        tuple: The schedules sorted by time, as (path, minutes since midnight,
+        "HH:MM", name, position in file) tuples, their sorted minutes, and
+        whether blank or malformed lines were skipped.
+    """
+    st = os.stat(SCHEDULES_FILE)
+    key = (st.st_mtime_ns, st.st_size)
+    if key != _cache["key"]:
+        schedules = []
+        skipped = False
+        with open(SCHEDULES_FILE, "r", encoding="utf-8") as f:
+            for lineno, line in enumerate(f):
+                line = line.strip()
+                if not line:
+                    skipped = True
+                    continue
+
+                try:
+                    path, sched_time_str, name = line.split(";")
+                    sched_hour, sched_min = map(int, sched_time_str.split(":"))
+                    sched_minutes = sched_hour * 60 + sched_min
+                    schedules.append(
+                        (path, sched_minutes, sched_time_str, name, lineno)
+                    )
+                except ValueError:
+                    log_message(f"Error parsing schedule line: {line}")
+                    skipped = True
+
+        # Sorting is stable, so schedules at the same time keep their file order
+        schedules.sort(key=lambda schedule: schedule[1])
+        _cache["key"] = key
+        _cache["parsed"] = schedules
+        _cache["minutes"] = [schedule[1] for schedule in schedules]
+        _cache["skipped"] = skipped
+    return _cache["parsed"], _cache["minutes"], _cache["skipped"]
+
+
+def _write_schedules(schedules: List[Schedule]) -> Tuple[int, int]:
+    """
+    Atomically replaces the schedules file with the given schedules.
+
+    The schedules are written in their original file order to a temporary
+    file that is then renamed over the schedules file, so a crash never
+    leaves a truncated file behind.
+
+    Args:
+        schedules (list): The schedules to keep, as returned by _read_schedules.
+
+    Returns:
+        tuple: The (st_mtime_ns, st_size) cache key of the written file, taken
+        before the rename so a concurrent append cannot slip into it.
+    """
+    tmp_path = f"{SCHEDULES_FILE}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8", buffering=1 << 16) as f:
+            f.writelines(
+                f"{path};{sched_time_str};{name}\n"
+                for path, _, sched_time_str, name, _ in sorted(
+                    schedules, key=lambda schedule: schedule[4]
+                )
+            )
+            f.flush()
+            st = os.fstat(f.fileno())
+        os.replace(tmp_path, SCHEDULES_FILE)
+        return st.st_mtime_ns, st.st_size
+    except OSError:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+
+
+def _seconds_until_next(minutes: List[int]) -> float:
+    """
+    Computes how long the service can sleep before the next schedule is due.
+
+    Args:
+        minutes (list): The sorted times of the pending schedules, in minutes
+        since midnight.
+
+    Returns:
+        float: Seconds until the start of the earliest upcoming schedule's
+        minute, at least 1 and at most MAX_SLEEP.
+    """
+    now = datetime.datetime.now()
+    current_minutes = now.hour * 60 + now.minute
+    i = bisect.bisect_right(minutes, current_minutes)
+    if i == len(minutes):
+        return MAX_SLEEP
+
+    seconds = (minutes[i] - current_minutes) * 60 - now.second
+    seconds -= now.microsecond / 1_000_000
+    return min(MAX_SLEEP, max(1, seconds))
+
+
+def _handle_sighup(signum: int, frame: Optional[FrameType]) -> None:
+    """
+    SIGHUP handler. Forces the schedules file to be re-read on wakeup and
+    the log file to be reopened on the next write.
+
+    Args:
+        signum (int): The received signal number.
+        frame (FrameType): The interrupted stack frame.
+    """
+    # pylint: disable=unused-argument
+    _cache["key"] = None
+    # Only flag the reopen: the handler may interrupt a flush holding _log_lock
+    _log_state["reopen"] = True
+
+
+def _watch_schedules() -> Optional[int]:
+    """
+    Starts watching the schedules file for changes with inotify.
+
+    The directory containing the file is watched rather than the file itself,
+    because the file is replaced, not modified in place, when it is rewritten.
+
+    Returns:
+        int: A non-blocking inotify file descriptor, or None if inotify is
+        not available on this system.
+    """
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        inotify_init1 = libc.inotify_init1
+        inotify_add_watch = libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+
+    fd = inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    if fd < 0:
+        return None
+    directory = os.path.dirname(os.path.abspath(SCHEDULES_FILE))
+    mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_DELETE
+    if inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+def _drain(fd: int) -> None:
+    """
+    Reads and discards everything pending on a non-blocking file descriptor.
+
+    Args:
+        fd (int): The file descriptor to drain.
+    """
+    try:
+        while os.read(fd, 4096):
+            pass
+    except BlockingIOError:
+        pass
+
+
 def main() -> None:
     """
-    Main service loop. Continuously checks for scheduled backups,
-    executes them if the current time matches, and cleans up schedules.
+    Main service loop. Checks for scheduled backups, executes them if the
+    current time matches, cleans up schedules, and then sleeps until the
+    next schedule is due or the schedules change. Changes are detected with
+    inotify where available, and reported by a SIGHUP otherwise.
     """
+    # Exit through sys.exit on SIGTERM so buffered log lines are flushed
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    # Signals are also written to a pipe so they interrupt the sleep below
+    wakeup_r, wakeup_w = os.pipe()
+    os.set_blocking(wakeup_r, False)
+    os.set_blocking(wakeup_w, False)
+    signal.set_wakeup_fd(wakeup_w)
+    signal.signal(signal.SIGHUP, _handle_sighup)
+    poller = select.poll()
+    poller.register(wakeup_r, select.POLLIN)
+
+    # Waking up is enough: the stat-keyed cache decides whether to re-parse
+    inotify_fd = _watch_schedules()
+    if inotify_fd is not None:
+        poller.register(inotify_fd, select.POLLIN)
+
     while True:
+        sleep_seconds = MAX_SLEEP
         try:
             if os.path.exists(SCHEDULES_FILE):
-                with open(SCHEDULES_FILE, "r", encoding="utf-8") as f:
-                    schedules = f.readlines()
+                schedules, minutes, skipped = _read_schedules()
 
                 now = datetime.datetime.now()
-                current_time_str = now.strftime("%H:%M")
                 current_minutes = now.hour * 60 + now.minute
 
-                remaining_schedules = []
-                for line in schedules:
-                    line = line.strip()
-                    if not line:
-                        continue
-
-                    try:
-                        path, sched_time_str, name = line.split(";")
-                        sched_hour, sched_min = map(int, sched_time_str.split(":"))
-                        sched_total_minutes = sched_hour * 60 + sched_min
-
-                        if sched_time_str == current_time_str:
-                            # Time match: execute backup and exclude from remaining schedules
-                            perform_backup(path, name)
-                        elif sched_total_minutes < current_minutes:
-                            # Schedule has already passed today; exclude from remaining schedules
-                            pass
-                        else:
-                            remaining_schedules.append(line)
-                    except (ValueError, IndexError):
-                        log_message(f"Error parsing schedule line: {line}")
-
-                # Update file if changed
-                if len(remaining_schedules) != len(schedules):
-                    with open(SCHEDULES_FILE, "w", encoding="utf-8") as f:
-                        for s in remaining_schedules:
-                            f.write(f"{s}\n")
+                # Schedules before i have already passed today, those in [i, j)
+                # are due now; both are excluded from the remaining schedules
+                i = bisect.bisect_left(minutes, current_minutes)
+                j = bisect.bisect_right(minutes, current_minutes, lo=i)
+                futures = {
+                    _pool.submit(perform_backup, path, name): path
+                    for path, _, _, name, _ in schedules[i:j]
+                }
+                concurrent.futures.wait(futures)
+                for future, path in futures.items():
+                    # perform_backup logs expected errors; report anything else
+                    error = future.exception()
+                    if error is not None:
+                        log_message(f"Error performing backup for {path}: {error!r}")
+
+                # Update file if changed; skipped lines are dropped from it too
+                if j > 0 or skipped:
+                    remaining_schedules = schedules[j:]
+                    key = _write_schedules(remaining_schedules)
+
+                    # The rewritten file holds exactly the remaining schedules
+                    _cache["key"] = key
+                    _cache["parsed"] = remaining_schedules
+                    _cache["minutes"] = minutes = minutes[j:]
+                    _cache["skipped"] = False
+
+                sleep_seconds = _seconds_until_next(minutes)
 
         except OSError as e:
             log_message(f"Error in service loop: {str(e)}")
+            # Retry soon, but not after a schedule that is due sooner
+            sleep_seconds = min(RETRY_SLEEP, _seconds_until_next(_cache["minutes"]))
 
-        time.sleep(45)
+        _flush_log()
+        for fd, _ in poller.poll(sleep_seconds * 1000):
+            _drain(fd)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,71 @@
+"""
+Regression tests for backup_service.py.
+"""
+
+import os
+import sys
+import tarfile
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import backup_service  # pylint: disable=wrong-import-position
+
+
+class IncrementalHardLinkTest(unittest.TestCase):
+    """
+    Incremental archives must stay extractable when the source has hard links.
+    """
+
+    def setUp(self) -> None:
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        os.chdir(self._tmp.name)
+        self._incremental = backup_service.BACKUP_INCREMENTAL
+        self._compressor = backup_service.BACKUP_COMPRESSOR
+        backup_service.BACKUP_INCREMENTAL = True
+        backup_service.BACKUP_COMPRESSOR = ""
+
+    def tearDown(self) -> None:
+        backup_service.BACKUP_INCREMENTAL = self._incremental
+        backup_service.BACKUP_COMPRESSOR = self._compressor
+        backup_service._close_log()  # pylint: disable=protected-access
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def test_unchanged_hard_link_target(self) -> None:
+        """
+        An unchanged, skipped file must not leave a dangling link member.
+        """
+        os.makedirs("src")
+        with open("src/a.txt", "w", encoding="utf-8") as f:
+            f.write("content\n")
+        os.link("src/a.txt", "src/hl.txt")
+
+        backup_service.perform_backup("src", "x")
+        backup_service.perform_backup("src", "x")
+
+        incremental = [
+            name
+            for name in os.listdir(backup_service.BACKUPS_DIR)
+            if name.startswith("x.") and name.endswith(".tar") and name != "x.tar"
+        ]
+        self.assertEqual(len(incremental), 1)
+
+        with tarfile.open(os.path.join("backups", incremental[0])) as tar:
+            names = tar.getnames()
+            for member in tar.getmembers():
+                if member.islnk():
+                    self.assertIn(member.linkname, names)
+            tar.extractall("restore")
+
+        manifest = backup_service._load_manifest(  # pylint: disable=protected-access
+            os.path.join("backups", "x.manifest.json")
+        )
+        self.assertIn("src/hl.txt", manifest)
+        self.assertEqual(manifest["src/hl.txt"], manifest["src/a.txt"])
+
+
+if __name__ == "__main__":
+    unittest.main()